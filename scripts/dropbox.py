@@ -8,56 +8,108 @@ Dropbox helper for Atlas/Clawdbot
 - Automatic token refresh on 401
 """
 
-import urllib.request
-import urllib.parse
-import urllib.error
+import asyncio
 import json
 import os
+import socket
 import sys
+import threading
+import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # optional speedup; requests stays the only hard dependency
+    orjson = None
+
 CONFIG_PATH = Path.home() / ".config/atlas/dropbox.env"
 
-# Global config cache
-_config = None
+# Shared HTTP session: keep-alive + TLS reuse across API calls
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+_session.mount("https://", _adapter)
+# Compressed responses matter for large list_folder/search result pages;
+# requests decodes gzip transparently
+_session.headers["Accept-Encoding"] = "gzip, deflate"
 
 
-def load_config():
-    """Load all credentials from the .env file."""
-    global _config
-    if _config is not None:
-        return _config
-    
+@lru_cache(maxsize=4)
+def _parse_config(mtime_ns, size):
+    """Parse the .env file, keyed on its stat signature."""
     config = {}
-    with open(CONFIG_PATH) as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                key, value = line.split("=", 1)
-                config[key.strip()] = value.strip()
-    
-    _config = config
+    for line in CONFIG_PATH.read_text().splitlines():
+        line = line.strip()
+        if line and not line.startswith("#") and "=" in line:
+            key, value = line.split("=", 1)
+            config[key.strip()] = value.strip()
     return config
 
 
+def load_config():
+    """Load all credentials, re-reading only when the .env changes on disk."""
+    st = os.stat(CONFIG_PATH)
+    return _parse_config(st.st_mtime_ns, st.st_size)
+
+
 def save_config(config):
     """Save config back to .env file."""
-    global _config
     lines = []
     for key, value in config.items():
         lines.append(f"{key}={value}")
-    
+
     with open(CONFIG_PATH, 'w') as f:
         f.write("\n".join(lines) + "\n")
-    
-    _config = config
+
+
+def _json_dumps(obj):
+    """Serialize a request body to bytes, via orjson when available.
+
+    Dropbox-API-Arg headers stay on json.dumps: header values must be
+    ASCII and orjson does not escape non-ASCII characters.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _json_loads(data):
+    """Parse a response body, via orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Serializes refreshes so concurrent 401s (e.g. download-dir workers)
+# cannot interleave writes to the credentials file
+_refresh_lock = threading.Lock()
+_last_refresh = 0.0
 
 
 def refresh_access_token():
-    """Refresh the access token using the refresh token."""
+    """Refresh the access token using the refresh token.
+
+    Thread-safe: one refresh runs at a time, and threads that were
+    queued behind it reuse its result instead of refreshing again.
+    """
+    global _last_refresh
+    with _refresh_lock:
+        # Another thread may have refreshed while we waited for the lock
+        if time.time() - _last_refresh < 5:
+            return load_config().get("DROPBOX_ACCESS_TOKEN")
+        token = _do_refresh()
+        _last_refresh = time.time()
+        return token
+
+
+def _do_refresh():
     config = load_config()
-    
+
     refresh_token = config.get("DROPBOX_REFRESH_TOKEN")
     app_key = config.get("DROPBOX_APP_KEY")
     app_secret = config.get("DROPBOX_APP_SECRET")
@@ -65,153 +117,349 @@ def refresh_access_token():
     if not all([refresh_token, app_key, app_secret]):
         raise ValueError("Missing DROPBOX_REFRESH_TOKEN, DROPBOX_APP_KEY, or DROPBOX_APP_SECRET in config")
     
-    # Build the token refresh request
-    url = "https://api.dropboxapi.com/oauth2/token"
-    data = urllib.parse.urlencode({
-        "grant_type": "refresh_token",
-        "refresh_token": refresh_token,
-        "client_id": app_key,
-        "client_secret": app_secret
-    }).encode()
-    
-    req = urllib.request.Request(
-        url,
-        data=data,
-        headers={"Content-Type": "application/x-www-form-urlencoded"}
+    # Build the token refresh request; oauth2/token authenticates via the
+    # body, so drop the session's cached (possibly expired) bearer header
+    resp = _session.post(
+        "https://api.dropboxapi.com/oauth2/token",
+        headers={"Authorization": None},
+        data={
+            "grant_type": "refresh_token",
+            "refresh_token": refresh_token,
+            "client_id": app_key,
+            "client_secret": app_secret
+        }
     )
-    
-    try:
-        with urllib.request.urlopen(req) as resp:
-            result = json.loads(resp.read())
-            new_access_token = result.get("access_token")
-            
-            if not new_access_token:
-                raise ValueError("No access_token in refresh response")
-            
-            # Update config with new access token
-            config["DROPBOX_ACCESS_TOKEN"] = new_access_token
-            save_config(config)
-            
-            print("🔄 Access token refreshed", file=sys.stderr)
-            return new_access_token
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode() if e.fp else ""
-        raise RuntimeError(f"Token refresh failed: {e.code} - {error_body}")
+
+    if not resp.ok:
+        raise RuntimeError(f"Token refresh failed: {resp.status_code} - {resp.text}")
+
+    result = resp.json()
+    new_access_token = result.get("access_token")
+
+    if not new_access_token:
+        raise ValueError("No access_token in refresh response")
+
+    # Update config with new access token and its expiry (60 s safety margin)
+    config["DROPBOX_ACCESS_TOKEN"] = new_access_token
+    if "expires_in" in result:
+        config["DROPBOX_TOKEN_EXPIRES_AT"] = str(int(time.time()) + int(result["expires_in"]) - 60)
+    save_config(config)
+
+    # New token invalidates whatever the session had cached
+    global _auth_valid_until
+    _session.headers["Authorization"] = f"Bearer {new_access_token}"
+    _auth_valid_until = 0.0
+
+    print("🔄 Access token refreshed", file=sys.stderr)
+    return new_access_token
 
 
 def get_access_token():
-    """Get current access token from config."""
+    """Get current access token, refreshing proactively just before expiry."""
     config = load_config()
+    expires_at = config.get("DROPBOX_TOKEN_EXPIRES_AT")
+    if expires_at and time.time() >= int(expires_at):
+        return refresh_access_token()
     return config.get("DROPBOX_ACCESS_TOKEN")
 
 
+# How long the session's cached Authorization header stays trustworthy
+_auth_valid_until = 0.0
+
+
+def _auth_session():
+    """Return the shared session, rebinding Authorization only when stale.
+
+    Inside the validity window this is a single float comparison; the
+    config stat/parse and header formatting only happen when the cached
+    token may have expired.
+    """
+    global _auth_valid_until
+    now = time.time()
+    if now < _auth_valid_until:
+        return _session
+
+    config = load_config()
+    expires_at = int(config.get("DROPBOX_TOKEN_EXPIRES_AT") or 0)
+    if expires_at and now >= expires_at:
+        refresh_access_token()
+        expires_at = int(load_config().get("DROPBOX_TOKEN_EXPIRES_AT") or 0)
+    else:
+        _session.headers["Authorization"] = f"Bearer {config.get('DROPBOX_ACCESS_TOKEN')}"
+    # Without a recorded expiry, re-check the config every 60 s
+    _auth_valid_until = expires_at or now + 60
+    return _session
+
+
 def api_call(endpoint, data=None, content_type="application/json", retry_on_401=True):
     """Make a Dropbox API call with automatic token refresh."""
-    token = get_access_token()
     url = f"https://api.dropboxapi.com/2/{endpoint}"
-    
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": content_type
-    }
-    
-    req = urllib.request.Request(
+
+    resp = _auth_session().post(
         url,
-        headers=headers,
-        data=json.dumps(data).encode() if data else None
+        headers={"Content-Type": content_type},
+        data=_json_dumps(data) if data else None
     )
-    
-    try:
-        with urllib.request.urlopen(req) as resp:
-            return json.loads(resp.read())
-    except urllib.error.HTTPError as e:
-        if e.code == 401 and retry_on_401:
-            # Token expired, refresh and retry
-            global _config
-            _config = None  # Clear cache
-            refresh_access_token()
-            return api_call(endpoint, data, content_type, retry_on_401=False)
-        raise
+
+    if resp.status_code == 401 and retry_on_401:
+        # Token expired, refresh and retry
+        refresh_access_token()
+        return api_call(endpoint, data, content_type, retry_on_401=False)
+    resp.raise_for_status()
+    return _json_loads(resp.content)
+
+
+# Fixed-shape Dropbox-API-Arg headers: only the variable fields get
+# JSON-escaped (via json.dumps, which keeps header values ASCII) and are
+# spliced into a prebuilt template instead of serializing a dict per call
+_UPLOAD_ARG_TEMPLATE = '{"path": %s, "mode": %s, "autorename": true, "mute": false}'
+
+
+def _path_arg(path):
+    """Preformatted Dropbox-API-Arg for the common {"path": ...} shape."""
+    return '{"path": %s}' % json.dumps(path)
 
 
 def content_api_call(endpoint, api_arg, dest_path=None, retry_on_401=True):
-    """Make a Dropbox content API call (download) with automatic token refresh."""
-    token = get_access_token()
+    """Make a Dropbox content API call (download) with automatic token refresh.
+
+    api_arg may be a dict or an already-formatted JSON string.
+    """
     url = f"https://content.dropboxapi.com/2/{endpoint}"
-    
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Dropbox-API-Arg": json.dumps(api_arg)
-    }
-    
-    req = urllib.request.Request(url, headers=headers, data=b"")
-    
-    try:
-        with urllib.request.urlopen(req) as resp:
-            if dest_path:
-                with open(dest_path, 'wb') as f:
-                    f.write(resp.read())
-                return {"saved": dest_path}
-            return resp.read()
-    except urllib.error.HTTPError as e:
-        if e.code == 401 and retry_on_401:
-            global _config
-            _config = None
-            refresh_access_token()
-            return content_api_call(endpoint, api_arg, dest_path, retry_on_401=False)
-        raise
+    if not isinstance(api_arg, str):
+        api_arg = json.dumps(api_arg)
+
+    resp = _auth_session().post(
+        url,
+        headers={"Dropbox-API-Arg": api_arg},
+        stream=True
+    )
+
+    if resp.status_code == 401 and retry_on_401:
+        resp.close()
+        refresh_access_token()
+        return content_api_call(endpoint, api_arg, dest_path, retry_on_401=False)
+    resp.raise_for_status()
+
+    with resp:
+        if dest_path:
+            # Stream to disk in 1 MiB chunks instead of buffering the whole body
+            with open(dest_path, 'wb') as f:
+                for chunk in resp.iter_content(1 << 20):
+                    f.write(chunk)
+            return {"saved": dest_path}
+        return resp.content
+
+
+def _advise_sequential(f):
+    """Hint the kernel that f will be read front to back (readahead).
+
+    TLS rules out os.sendfile for uploads — every byte goes through
+    userspace encryption — so aggressive readahead on the source file is
+    the remaining kernel-side win.
+    """
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
 
 
 def content_upload(local_path, dropbox_path, mode="add", retry_on_401=True):
     """Upload a file to Dropbox with automatic token refresh."""
-    token = get_access_token()
     url = "https://content.dropboxapi.com/2/files/upload"
-    
+
+    headers = {
+        "Dropbox-API-Arg": _UPLOAD_ARG_TEMPLATE % (json.dumps(dropbox_path), json.dumps(mode)),
+        "Content-Type": "application/octet-stream",
+        "Content-Length": str(os.path.getsize(local_path))
+    }
+
+    # Stream the file handle directly instead of slurping it into memory
     with open(local_path, 'rb') as f:
-        file_data = f.read()
-    
+        _advise_sequential(f)
+        resp = _auth_session().post(url, headers=headers, data=f)
+
+    if resp.status_code == 401 and retry_on_401:
+        refresh_access_token()
+        return content_upload(local_path, dropbox_path, mode, retry_on_401=False)
+    resp.raise_for_status()
+    return _json_loads(resp.content)
+
+
+# Dropbox rejects single-request uploads above 150 MB
+_UPLOAD_SESSION_THRESHOLD = 150 * 1024 * 1024
+
+
+def _upload_session_call(endpoint, api_arg, body, retry_on_401=True):
+    """POST one upload-session chunk with automatic token refresh."""
+    url = f"https://content.dropboxapi.com/2/{endpoint}"
     headers = {
-        "Authorization": f"Bearer {token}",
-        "Dropbox-API-Arg": json.dumps({
-            "path": dropbox_path,
-            "mode": mode,
-            "autorename": True,
-            "mute": False
-        }),
+        "Dropbox-API-Arg": json.dumps(api_arg),
         "Content-Type": "application/octet-stream"
     }
-    
-    req = urllib.request.Request(url, headers=headers, data=file_data)
-    
-    try:
-        with urllib.request.urlopen(req) as resp:
-            return json.loads(resp.read())
-    except urllib.error.HTTPError as e:
-        if e.code == 401 and retry_on_401:
-            global _config
-            _config = None
-            refresh_access_token()
-            return content_upload(local_path, dropbox_path, mode, retry_on_401=False)
-        raise
+
+    resp = _auth_session().post(url, headers=headers, data=body)
+
+    if resp.status_code == 401 and retry_on_401:
+        refresh_access_token()
+        return _upload_session_call(endpoint, api_arg, body, retry_on_401=False)
+    resp.raise_for_status()
+    return _json_loads(resp.content) if resp.content else {}
+
+
+def upload_large(local_path, dropbox_path, mode="add", chunk=8 << 20):
+    """Upload a large file via an upload session, one chunk at a time.
+
+    Splits the file into `chunk`-sized pieces so no single request hits
+    the 150 MB cap, and a transient failure only loses one chunk.
+    """
+    with open(local_path, 'rb') as f:
+        _advise_sequential(f)
+        result = _upload_session_call("files/upload_session/start", {}, f.read(chunk))
+        session_id = result["session_id"]
+        offset = f.tell()
+
+        while True:
+            piece = f.read(chunk)
+            if not piece:
+                break
+            _upload_session_call(
+                "files/upload_session/append_v2",
+                {"cursor": {"session_id": session_id, "offset": offset}},
+                piece
+            )
+            offset = f.tell()
+
+        return _upload_session_call(
+            "files/upload_session/finish",
+            {
+                "cursor": {"session_id": session_id, "offset": offset},
+                "commit": {
+                    "path": dropbox_path,
+                    "mode": mode,
+                    "autorename": True,
+                    "mute": False
+                }
+            },
+            b""
+        )
+
+
+def iter_folder(path=""):
+    """Yield folder entries page by page, prefetching the next page.
+
+    Each continue cursor only exists once its page has arrived, so pages
+    cannot be fetched truly in parallel; instead the next request is
+    issued on a worker thread while the caller consumes the current page.
+    """
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        # 2000 is the API maximum; fewer pages means fewer round-trips
+        data = api_call("files/list_folder", {"path": path, "limit": 2000})
+        while True:
+            future = None
+            if data.get("has_more"):
+                future = pool.submit(api_call, "files/list_folder/continue",
+                                     {"cursor": data["cursor"]})
+            yield from data.get("entries", [])
+            if future is None:
+                return
+            data = future.result()
 
 
 def list_folder(path=""):
     """List contents of a folder."""
-    data = api_call("files/list_folder", {"path": path, "limit": 100})
-    entries = data.get("entries", [])
-    
-    while data.get("has_more"):
-        data = api_call("files/list_folder/continue", {"cursor": data["cursor"]})
-        entries.extend(data.get("entries", []))
-    
+    return list(iter_folder(path))
+
+
+# Saved list_folder cursors, keyed by folder path, for incremental sync
+CURSOR_CACHE_PATH = CONFIG_PATH.with_name("dropbox_cursors.json")
+
+
+def _load_cursors():
+    try:
+        return _json_loads(CURSOR_CACHE_PATH.read_bytes())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cursor(path, cursor):
+    cursors = _load_cursors()
+    cursors[path] = cursor
+    try:
+        CURSOR_CACHE_PATH.write_bytes(_json_dumps(cursors))
+    except OSError:
+        pass  # cursor cache is best-effort
+
+
+def _baseline_cursor(path):
+    """Record and return a fresh cursor for path (no entries re-listed)."""
+    data = api_call("files/list_folder/get_latest_cursor", {"path": path})
+    _save_cursor(path, data["cursor"])
+    return data["cursor"]
+
+
+def list_changes(path=""):
+    """Return entries changed since the last saved cursor for path.
+
+    The first call records a baseline cursor and returns nothing; later
+    calls fetch only the delta instead of re-listing the whole folder.
+    """
+    cursor = _load_cursors().get(path)
+    if cursor is None:
+        _baseline_cursor(path)
+        return []
+
+    entries = []
+    data = {"cursor": cursor, "has_more": True}
+    try:
+        while data.get("has_more"):
+            data = api_call("files/list_folder/continue", {"cursor": data["cursor"]})
+            entries.extend(data.get("entries", []))
+    except requests.HTTPError as e:
+        resp = e.response
+        if resp is not None and resp.status_code == 409 and '"reset"' in resp.text:
+            # Dropbox expired the cursor; re-baseline so the next call works
+            _baseline_cursor(path)
+            return []
+        raise
+    _save_cursor(path, data["cursor"])
     return entries
 
 
+def wait_for_changes(path="", timeout=30):
+    """Long-poll until something changes under path; returns True if it did.
+
+    Uses the notify host, which takes no Authorization header, so the
+    request goes out directly rather than through the shared session.
+    """
+    cursor = _load_cursors().get(path)
+    if cursor is None:
+        cursor = _baseline_cursor(path)
+
+    for attempt in (0, 1):
+        resp = requests.post(
+            "https://notify.dropboxapi.com/2/files/list_folder/longpoll",
+            headers={"Content-Type": "application/json"},
+            data=_json_dumps({"cursor": cursor, "timeout": timeout}),
+            timeout=timeout + 90  # server may hold the request past our timeout
+        )
+        if attempt == 0 and resp.status_code == 409 and '"reset"' in resp.text:
+            # Dropbox expired the cursor; re-baseline and retry the poll
+            cursor = _baseline_cursor(path)
+            continue
+        resp.raise_for_status()
+        result = _json_loads(resp.content)
+        if result.get("backoff"):
+            time.sleep(result["backoff"])
+        return result.get("changes", False)
+
+
 def search(query, path=""):
     """Search for files/folders."""
     data = api_call("files/search_v2", {
         "query": query,
-        "options": {"path": path, "max_results": 50}
+        "options": {"path": path, "max_results": 1000}
     })
     return data.get("matches", [])
 
@@ -220,50 +468,186 @@ def download(dropbox_path, local_path=None):
     """Download a file."""
     if not local_path:
         local_path = os.path.basename(dropbox_path)
-    return content_api_call("files/download", {"path": dropbox_path}, local_path)
+    return content_api_call("files/download", _path_arg(dropbox_path), local_path)
+
+
+def download_dir(dropbox_path, local_dir=".", workers=8):
+    """Download every file in a Dropbox folder on a thread pool.
+
+    Returns (entry, result) pairs in listing order, where result is the
+    download result or the exception that file raised.
+    """
+    os.makedirs(local_dir, exist_ok=True)
+    entries = [e for e in iter_folder(dropbox_path) if e['.tag'] == 'file']
+
+    def fetch(entry):
+        return download(entry['path_display'], os.path.join(local_dir, entry['name']))
+
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fetch, e) for e in entries]
+        for entry, future in zip(entries, futures):
+            try:
+                results.append((entry, future.result()))
+            except Exception as exc:
+                results.append((entry, exc))
+    return results
 
 
 def upload(local_path, dropbox_path):
-    """Upload a file."""
+    """Upload a file, switching to an upload session for large files."""
+    if os.path.getsize(local_path) >= _UPLOAD_SESSION_THRESHOLD:
+        return upload_large(local_path, dropbox_path)
     return content_upload(local_path, dropbox_path)
 
 
+async def _download_one_async(session, sem, dropbox_path, local_path):
+    """Download a single file, bounded by the shared semaphore."""
+    url = "https://content.dropboxapi.com/2/files/download"
+    headers = {"Dropbox-API-Arg": _path_arg(dropbox_path)}
+    async with sem:
+        async with session.post(url, headers=headers) as resp:
+            resp.raise_for_status()
+            with open(local_path, 'wb') as f:
+                async for chunk in resp.content.iter_chunked(1 << 20):
+                    f.write(chunk)
+    return {"saved": local_path}
+
+
+async def _upload_one_async(session, sem, local_path, dropbox_path):
+    """Upload a single file, bounded by the shared semaphore."""
+    url = "https://content.dropboxapi.com/2/files/upload"
+    headers = {
+        "Dropbox-API-Arg": _UPLOAD_ARG_TEMPLATE % (json.dumps(dropbox_path), json.dumps("add")),
+        "Content-Type": "application/octet-stream"
+    }
+    async with sem:
+        with open(local_path, 'rb') as f:
+            async with session.post(url, headers=headers, data=f) as resp:
+                resp.raise_for_status()
+                return await resp.json()
+
+
+async def _run_many(worker, pairs):
+    """Run one worker per (src, dest) pair concurrently on a shared session."""
+    try:
+        import aiohttp  # only needed for the batch commands
+    except ImportError:
+        raise RuntimeError(
+            "download-many/upload-many require aiohttp (pip install aiohttp)"
+        ) from None
+
+    token = get_access_token()
+    connector = aiohttp.TCPConnector(limit=16, limit_per_host=16, ttl_dns_cache=300)
+    sem = asyncio.Semaphore(16)
+
+    async with aiohttp.ClientSession(
+        connector=connector,
+        headers={"Authorization": f"Bearer {token}"}
+    ) as session:
+        tasks = [
+            asyncio.create_task(worker(session, sem, src, dest))
+            for src, dest in pairs
+        ]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def download_many(pairs):
+    """Download several (dropbox_path, local_path) pairs concurrently."""
+    return asyncio.run(_run_many(_download_one_async, pairs))
+
+
+def upload_many(pairs):
+    """Upload several (local_path, dropbox_path) pairs concurrently."""
+    return asyncio.run(_run_many(_upload_one_async, pairs))
+
+
 def create_folder(path):
     """Create a folder."""
     return api_call("files/create_folder_v2", {"path": path, "autorename": False})
 
 
-def get_account(retry_on_401=True):
-    """Get current account info with automatic token refresh."""
-    token = get_access_token()
-    req = urllib.request.Request(
+# Account info barely changes; cache it on disk across CLI invocations
+ACCOUNT_CACHE_PATH = CONFIG_PATH.with_name("dropbox_account.json")
+_ACCOUNT_CACHE_TTL = 86400  # account info changes on the order of days
+
+
+def get_account(retry_on_401=True, use_cache=True):
+    """Get current account info, cached on disk for a day."""
+    if use_cache:
+        try:
+            if time.time() - os.stat(ACCOUNT_CACHE_PATH).st_mtime < _ACCOUNT_CACHE_TTL:
+                return _json_loads(ACCOUNT_CACHE_PATH.read_bytes())
+        except (OSError, ValueError):
+            pass  # missing or corrupt cache: fall through to the API
+
+    resp = _auth_session().post(
         "https://api.dropboxapi.com/2/users/get_current_account",
-        headers={
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        },
+        headers={"Content-Type": "application/json"},
         data=b"null"
     )
+    if resp.status_code == 401 and retry_on_401:
+        refresh_access_token()
+        return get_account(retry_on_401=False, use_cache=False)
+    resp.raise_for_status()
+
+    info = _json_loads(resp.content)
     try:
-        with urllib.request.urlopen(req) as resp:
-            return json.loads(resp.read())
-    except urllib.error.HTTPError as e:
-        if e.code == 401 and retry_on_401:
-            global _config
-            _config = None
-            refresh_access_token()
-            return get_account(retry_on_401=False)
-        raise
+        ACCOUNT_CACHE_PATH.write_bytes(_json_dumps(info))
+    except OSError:
+        pass  # cache is best-effort
+    return info
+
+
+def _fmt_folder(e):
+    return f"📁 {e['name']}"
+
+
+def _fmt_file(e):
+    return f"📄 {e['name']} ({e.get('size', 0)} bytes)"
+
+
+def _fmt_other(e):
+    return f"📄 {e['name']}"
+
+
+# ls formatting dispatched on '.tag' instead of per-entry branching
+_LS_FORMATTERS = {"folder": _fmt_folder, "file": _fmt_file}
+
+
+def _warm_dns():
+    """Resolve the API hosts in the background during CLI startup.
+
+    Connections in the pool keep their resolved peer for their lifetime;
+    this only hides the very first lookup behind argument and config
+    parsing (served from the local resolver cache when one is running).
+    """
+    def resolve():
+        for host in ("api.dropboxapi.com", "content.dropboxapi.com"):
+            try:
+                socket.getaddrinfo(host, 443)
+            except OSError:
+                pass  # the real request will surface the error
+    threading.Thread(target=resolve, daemon=True).start()
 
 
 def main():
     parser = argparse.ArgumentParser(description="Dropbox CLI for Atlas")
+    _warm_dns()
     subparsers = parser.add_subparsers(dest="command", required=True)
     
     # list
     ls_parser = subparsers.add_parser("ls", help="List folder contents")
     ls_parser.add_argument("path", nargs="?", default="", help="Folder path")
     
+    # changes
+    ch_parser = subparsers.add_parser("changes", help="List changes since last check")
+    ch_parser.add_argument("path", nargs="?", default="", help="Folder path")
+    ch_parser.add_argument("--watch", action="store_true",
+                           help="Long-poll until something changes first")
+    ch_parser.add_argument("--timeout", type=int, default=30,
+                           help="Long-poll timeout in seconds")
+
     # search
     search_parser = subparsers.add_parser("search", help="Search files")
     search_parser.add_argument("query", help="Search query")
@@ -279,8 +663,26 @@ def main():
     ul_parser.add_argument("local", help="Local file path")
     ul_parser.add_argument("remote", help="Dropbox destination path")
     
+    # download-dir
+    dld_parser = subparsers.add_parser("download-dir", help="Download all files in a folder")
+    dld_parser.add_argument("path", help="Dropbox folder path")
+    dld_parser.add_argument("--dir", default=".", help="Local output directory")
+    dld_parser.add_argument("--workers", type=int, default=8, help="Parallel downloads")
+
+    # download-many
+    dlm_parser = subparsers.add_parser("download-many", help="Download several files concurrently")
+    dlm_parser.add_argument("paths", nargs="+", help="Dropbox paths")
+    dlm_parser.add_argument("--dir", default=".", help="Local output directory")
+
+    # upload-many
+    ulm_parser = subparsers.add_parser("upload-many", help="Upload several files concurrently")
+    ulm_parser.add_argument("pairs", nargs="+", metavar="LOCAL REMOTE",
+                            help="Alternating local and remote path pairs")
+
     # account
-    subparsers.add_parser("account", help="Show account info")
+    account_parser = subparsers.add_parser("account", help="Show account info")
+    account_parser.add_argument("--refresh", action="store_true",
+                                help="Bypass the cached account info")
     
     # mkdir
     mkdir_parser = subparsers.add_parser("mkdir", help="Create folder")
@@ -288,19 +690,27 @@ def main():
     
     args = parser.parse_args()
     
+    # Per-entry print() flushes line by line; batch listing output instead
+    out = []
+
     if args.command == "ls":
-        entries = list_folder(args.path)
-        for e in entries:
-            icon = "📁" if e['.tag'] == 'folder' else "📄"
-            size = f" ({e.get('size', 0)} bytes)" if e['.tag'] == 'file' else ""
-            print(f"{icon} {e['name']}{size}")
-    
+        formatters = _LS_FORMATTERS
+        for e in iter_folder(args.path):
+            out.append(formatters.get(e['.tag'], _fmt_other)(e))
+
+    elif args.command == "changes":
+        if args.watch:
+            while not wait_for_changes(args.path, args.timeout):
+                pass
+        for e in list_changes(args.path):
+            out.append(_LS_FORMATTERS.get(e['.tag'], _fmt_other)(e))
+
     elif args.command == "search":
         matches = search(args.query, args.path)
         for m in matches:
             meta = m.get('metadata', {}).get('metadata', {})
             icon = "📁" if meta.get('.tag') == 'folder' else "📄"
-            print(f"{icon} {meta.get('path_display', 'unknown')}")
+            out.append(f"{icon} {meta.get('path_display', 'unknown')}")
     
     elif args.command == "download":
         result = download(args.path, args.output)
@@ -310,8 +720,36 @@ def main():
         result = upload(args.local, args.remote)
         print(f"✅ Uploaded to: {result.get('path_display', args.remote)}")
     
+    elif args.command == "download-dir":
+        for entry, result in download_dir(args.path, args.dir, args.workers):
+            if isinstance(result, Exception):
+                out.append(f"❌ {entry['name']}: {result}")
+            else:
+                out.append(f"✅ Downloaded to: {result['saved']}")
+
+    elif args.command == "download-many":
+        os.makedirs(args.dir, exist_ok=True)
+        pairs = [(p, os.path.join(args.dir, os.path.basename(p))) for p in args.paths]
+        results = download_many(pairs)
+        for (remote, local), result in zip(pairs, results):
+            if isinstance(result, Exception):
+                out.append(f"❌ {remote}: {result}")
+            else:
+                out.append(f"✅ Downloaded to: {local}")
+
+    elif args.command == "upload-many":
+        if len(args.pairs) % 2:
+            parser.error("upload-many expects an even number of LOCAL REMOTE arguments")
+        pairs = list(zip(args.pairs[::2], args.pairs[1::2]))
+        results = upload_many(pairs)
+        for (local, remote), result in zip(pairs, results):
+            if isinstance(result, Exception):
+                out.append(f"❌ {local}: {result}")
+            else:
+                out.append(f"✅ Uploaded to: {result.get('path_display', remote)}")
+
     elif args.command == "account":
-        info = get_account()
+        info = get_account(use_cache=not args.refresh)
         print(f"Account: {info['name']['display_name']}")
         print(f"Email: {info['email']}")
     
@@ -319,6 +757,9 @@ def main():
         result = create_folder(args.path)
         print(f"✅ Created: {result['metadata']['path_display']}")
 
+    if out:
+        sys.stdout.write("\n".join(out) + "\n")
+
 
 if __name__ == "__main__":
     main()